@@ -2,6 +2,12 @@ import os
 from typing import Optional
 from pydantic import BaseModel
 
+from app.utils.load_env import ensure_env_loaded
+
+# Settings defaults read the environment when the class is defined, so the
+# .env file has to be loaded first
+ensure_env_loaded()
+
 
 class Settings(BaseModel):
     """Application settings."""
@@ -18,6 +24,8 @@ class Settings(BaseModel):
     # Cache settings
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     CACHE_TTL: int = 1800  # 30 minutes in seconds
+    FORECAST_PUBLISH_DELAY: int = 60  # seconds after each half-hour for new data
+    WARM_CACHE: bool = os.getenv("WARM_CACHE", "True").lower() == "true"
 
     # Scheduling settings
     MAX_JOB_DURATION_MINUTES: int = 1440  # 24 hours
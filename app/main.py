@@ -1,14 +1,19 @@
 """Main application module for the Green Time Schedule API."""
 
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
 
 # Load environment variables
 from app.config import settings
+from app.middleware import WildcardCORSMiddleware
 from app.routes import schedule, carbon, health
+from app.services.carbon_service import carbon_service
 from app.utils.exceptions import GreenScheduleException
+from app.utils.time_utils import seconds_until_next_period
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +21,42 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+logger = logging.getLogger(__name__)
+
+
+async def warm_forecast_cache() -> None:
+    """Keep upcoming forecasts cached, refreshing them after each publication."""
+    while True:
+        try:
+            await carbon_service.warm_cache()
+        except Exception as e:
+            # A failed warm-up must not stop the loop; requests fetch on demand
+            logger.warning(f"Failed to warm forecast cache: {e}")
+
+        # Wake just after the cached entries expire at the next publication
+        await asyncio.sleep(
+            seconds_until_next_period(time.time()) + settings.FORECAST_PUBLISH_DELAY + 1
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage resources shared across requests."""
+    warm_task = None
+    if settings.WARM_CACHE:
+        warm_task = asyncio.create_task(warm_forecast_cache())
+
+    yield
+
+    if warm_task is not None:
+        warm_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_task
+
+    # Close pooled connections to the Carbon Intensity API
+    await carbon_service.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -24,21 +65,20 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # For production, you'd want to restrict this
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS (allows all origins; for production, you'd want to restrict this)
+app.add_middleware(WildcardCORSMiddleware)
 
 # Include routers
 app.include_router(schedule.router, prefix=settings.API_V1_PREFIX)
 app.include_router(carbon.router, prefix=settings.API_V1_PREFIX)
-app.include_router(health.router)
+
+# Health and root endpoints read nothing from the request, so they are
+# served as plain ASGI endpoints outside FastAPI's routing pipeline
+app.add_route("/health", health.health_check, methods=["GET"])
+app.add_route("/", health.root, methods=["GET"])
 
 
 # Exception handlers
@@ -53,14 +93,9 @@ async def green_schedule_exception_handler(
     )
 
 
-@app.get("/")
-async def root():
-    """Root endpoint redirecting to docs."""
-    return {
-        "message": "Green Time Schedule API",
-        "docs": "/api/docs",
-        "version": "0.1.0",
-    }
+# Build the OpenAPI schema at startup instead of on the first docs request;
+# FastAPI serves the stored schema from then on
+app.openapi_schema = app.openapi()
 
 
 if __name__ == "__main__":
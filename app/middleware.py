@@ -0,0 +1,87 @@
+"""ASGI middleware for the Green Time Schedule API."""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers sent on every preflight response
+_PREFLIGHT_HEADERS = [
+    (
+        b"vary",
+        b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers",
+    ),
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+]
+
+# Headers appended to responses for cross-origin requests
+_SIMPLE_HEADERS = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+]
+
+# Header appended to responses for same-origin requests
+_VARY_ORIGIN_HEADERS = [(b"vary", b"Origin")]
+
+
+class WildcardCORSMiddleware:
+    """
+    Pure ASGI CORS middleware allowing any origin, method and header.
+
+    This is equivalent to Starlette's CORSMiddleware configured with wildcard
+    origins, methods and headers and with credentials allowed, but it scans the
+    raw ASGI header list once and appends pre-built header tuples instead of
+    parsing request and response headers on every call.
+
+    Because credentials are allowed, the request origin is echoed back rather
+    than sending a literal "*", which browsers reject for credentialed requests.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Initialize the middleware."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        requested_method = None
+        requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+
+        if origin is None:
+            cors_headers = _VARY_ORIGIN_HEADERS
+        elif scope["method"] == "OPTIONS" and requested_method is not None:
+            await self._preflight_response(send, origin, requested_headers)
+            return
+        else:
+            cors_headers = [(b"access-control-allow-origin", origin), *_SIMPLE_HEADERS]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    @staticmethod
+    async def _preflight_response(
+        send: Send, origin: bytes, requested_headers: bytes | None
+    ) -> None:
+        """Answer a CORS preflight request without calling the application."""
+        headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+        if requested_headers is not None:
+            # All headers are allowed, so mirror back whatever was requested
+            headers.append((b"access-control-allow-headers", requested_headers))
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
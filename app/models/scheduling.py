@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
 from app.models.carbon import CarbonIndex
@@ -14,6 +14,13 @@ class Priority(str, Enum):
     HIGH = "high"
 
 
+class SchedulingMode(str, Enum):
+    """How the scheduler picks a time slot."""
+
+    OPTIMAL = "optimal"
+    FIRST_GREEN = "first_green"
+
+
 class JobScheduleRequest(BaseModel):
     """Request model for scheduling a job."""
 
@@ -30,6 +37,22 @@ class JobScheduleRequest(BaseModel):
         None, description="Optional name/identifier for the job"
     )
     priority: Priority = Field(Priority.LOW, description="Priority level of the job")
+    mode: SchedulingMode = Field(
+        SchedulingMode.OPTIMAL,
+        description=(
+            "'optimal' picks the lowest-intensity slot; 'first_green' picks the "
+            "earliest very low intensity slot, without alternatives, and falls "
+            "back to 'optimal' if there is none"
+        ),
+    )
+
+    @field_validator("deadline_utc")
+    @classmethod
+    def _normalize_deadline(cls, value: datetime) -> datetime:
+        """Treat naive deadlines as UTC and convert aware ones to UTC."""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
 
 
 class TimeSlot(BaseModel):
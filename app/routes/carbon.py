@@ -1,6 +1,6 @@
 """API routes for carbon intensity forecasts."""
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Response
 from typing import Optional
 
 from app.models.carbon import CarbonForecast
@@ -25,7 +25,9 @@ async def get_carbon_forecast(
     intensity profile throughout the day.
     """
     try:
-        return await carbon_service.get_intensity_for_date(date)
+        # Serve the cached JSON directly; no Pydantic work on a cache hit
+        forecast_json = await carbon_service.get_intensity_for_date_json(date)
+        return Response(content=forecast_json, media_type="application/json")
     except CarbonAPIUnavailableError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except CarbonAPIResponseError as e:
@@ -54,7 +56,11 @@ async def get_carbon_forecast_range(
         end_date = start_date
 
     try:
-        return await carbon_service.get_intensity_for_date_range(start_date, end_date)
+        # Assembled from the cached per-day JSON, like the single-date route
+        forecasts_json = await carbon_service.get_intensity_for_date_range_json(
+            start_date, end_date
+        )
+        return Response(content=forecasts_json, media_type="application/json")
     except CarbonAPIUnavailableError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except CarbonAPIResponseError as e:
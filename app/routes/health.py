@@ -1,22 +1,86 @@
-"""API routes for health checks."""
+"""API routes for health checks and service information."""
 
-from fastapi import APIRouter
-from datetime import datetime
-from typing import Dict, Any
+import json
+import time
+from datetime import UTC, datetime
+from typing import Any, Callable, Dict
 
-router = APIRouter(tags=["health"])
+from starlette.types import Receive, Scope, Send
 
+# How long a rendered health payload is reused, in seconds
+HEALTH_PAYLOAD_MAX_AGE = 1.0
 
-@router.get("/health", response_model=Dict[str, Any])
-async def health_check():
-    """
-    Health check endpoint.
+# Most recently rendered health payload and when it was rendered
+_health_cache: Dict[str, Any] = {"rendered_at": 0.0, "payload": b""}
 
-    This endpoint returns the current status of the API and can be used
-    for monitoring and health checks.
-    """
-    return {
-        "status": "ok",
-        "timestamp": datetime.utcnow().isoformat(),
+# Root payload never changes, so it is rendered once
+_ROOT_PAYLOAD = json.dumps(
+    {
+        "message": "Green Time Schedule API",
+        "docs": "/api/docs",
         "version": "0.1.0",
     }
+).encode()
+
+
+class JSONEndpoint:
+    """
+    Plain ASGI endpoint returning a JSON body.
+
+    Used for routes that read nothing from the request, so they skip FastAPI's
+    request parsing, dependency injection and response encoding entirely.
+    """
+
+    def __init__(self, render: Callable[[], bytes]):
+        """
+        Initialize the endpoint.
+
+        Args:
+            render: Callable returning the JSON-encoded response body
+        """
+        self.render = render
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = self.render()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def get_health_payload() -> bytes:
+    """
+    Get the JSON-encoded health check payload.
+
+    The payload only changes through its timestamp, so it is re-rendered at
+    most once per HEALTH_PAYLOAD_MAX_AGE seconds.
+
+    Returns:
+        JSON-encoded health status
+    """
+    now = time.time()
+    if now - _health_cache["rendered_at"] > HEALTH_PAYLOAD_MAX_AGE:
+        timestamp = datetime.fromtimestamp(now, UTC).replace(tzinfo=None)
+        _health_cache["payload"] = json.dumps(
+            {
+                "status": "ok",
+                "timestamp": timestamp.isoformat(),
+                "version": "0.1.0",
+            }
+        ).encode()
+        _health_cache["rendered_at"] = now
+    return _health_cache["payload"]
+
+
+# Health check endpoint, for monitoring and liveness probes
+health_check = JSONEndpoint(get_health_payload)
+
+# Root endpoint pointing clients at the docs
+root = JSONEndpoint(lambda: _ROOT_PAYLOAD)
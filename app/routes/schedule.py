@@ -1,6 +1,6 @@
 """API routes for job scheduling."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from app.models.scheduling import JobScheduleRequest, JobScheduleResponse
 from app.services.schedule_service import schedule_service
@@ -25,7 +25,9 @@ async def schedule_job(request: JobScheduleRequest):
     time slots.
     """
     try:
-        return await schedule_service.schedule_job(request)
+        result = await schedule_service.schedule_job(request)
+        # Serialize directly to JSON bytes instead of going through jsonable_encoder
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except InvalidScheduleRequestError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except NoViableTimeSlotError as e:
@@ -2,20 +2,33 @@
 
 import logging
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Any, Tuple
 from threading import RLock
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sentinel distinguishing a missing key from a cached None
+_MISSING = object()
+
 
 class SimpleCache:
-    """A thread-safe in-memory cache with expiration."""
+    """
+    A thread-safe in-memory cache with expiration.
+
+    Writes take a lock; reads do not. Reads rely on single dict operations
+    being atomic under CPython's GIL, and only take the lock to evict an
+    expired entry.
+    """
 
     def __init__(self):
         """Initialize the cache."""
-        self._cache: Dict[str, Tuple[Any, Optional[float]]] = {}
+        # Values and expiry times are kept in separate flat dicts so that no
+        # per-entry tuple is allocated; keys without a TTL have no expiry entry.
+        self._values: Dict[str, Any] = {}
+        self._expiry: Dict[str, float] = {}
         self._lock = RLock()  # Reentrant lock for thread safety
 
     def get(self, key: str) -> Optional[Any]:
@@ -28,19 +41,22 @@ class SimpleCache:
         Returns:
             The cached value, or None if not found or expired
         """
-        with self._lock:
-            if key not in self._cache:
-                return None
-
-            value, expiry = self._cache[key]
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            return None
 
-            # Check if expired
-            if expiry is not None and expiry < time.time():
-                del self._cache[key]
-                return None
+        # Check if expired
+        expiry = self._expiry.get(key)
+        if expiry is not None and expiry < time.time():
+            with self._lock:
+                # Only evict if the entry was not refreshed in the meantime
+                if self._expiry.get(key) == expiry:
+                    self._values.pop(key, None)
+                    del self._expiry[key]
+            return None
 
-            logger.debug(f"Cache hit for {key}")
-            return value
+        logger.debug(f"Cache hit for {key}")
+        return value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
         """
@@ -55,11 +71,11 @@ class SimpleCache:
             True if successful
         """
         with self._lock:
-            expiry = None
+            self._values[key] = value
             if ttl_seconds is not None:
-                expiry = time.time() + ttl_seconds
-
-            self._cache[key] = (value, expiry)
+                self._expiry[key] = time.time() + ttl_seconds
+            else:
+                self._expiry.pop(key, None)
             return True
 
     def delete(self, key: str) -> bool:
@@ -73,8 +89,9 @@ class SimpleCache:
             True if deleted, False if key not found
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            self._expiry.pop(key, None)
+            if key in self._values:
+                del self._values[key]
                 return True
             return False
 
@@ -87,16 +104,16 @@ class SimpleCache:
         """
         with self._lock:
             now = time.time()
-            expired_keys = [
-                key
-                for key, (_, expiry) in self._cache.items()
-                if expiry is not None and expiry < now
-            ]
+            count = 0
 
-            for key in expired_keys:
-                del self._cache[key]
+            # Single pass over a snapshot of the keys that have an expiry
+            for key in list(self._expiry):
+                if self._expiry[key] < now:
+                    del self._expiry[key]
+                    self._values.pop(key, None)
+                    count += 1
 
-            return len(expired_keys)
+            return count
 
     def clear_all(self) -> int:
         """
@@ -106,8 +123,9 @@ class SimpleCache:
             Number of entries cleared
         """
         with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
+            count = len(self._values)
+            self._values.clear()
+            self._expiry.clear()
             return count
 
 
@@ -189,13 +207,19 @@ class CacheService:
             return False
 
     @staticmethod
-    def get_carbon_forecast_key(date: str, periods: Optional[List[int]] = None) -> str:
+    @lru_cache(maxsize=1024)
+    def get_carbon_forecast_key(
+        date: str, periods: Optional[Tuple[int, ...]] = None
+    ) -> str:
         """
         Generate a cache key for carbon forecast data.
 
+        Keys are memoized since the same few dates are looked up on every
+        request.
+
         Args:
             date: Date in YYYY-MM-DD format
-            periods: Optional list of specific periods to include in the key
+            periods: Optional tuple of specific periods to include in the key
 
         Returns:
             Cache key string
@@ -206,6 +230,20 @@ class CacheService:
         else:
             return f"carbon_forecast:{date}:all"
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_carbon_forecast_json_key(date: str) -> str:
+        """
+        Generate a cache key for serialized carbon forecast JSON.
+
+        Args:
+            date: Date in YYYY-MM-DD format
+
+        Returns:
+            Cache key string
+        """
+        return f"carbon_forecast:{date}:json"
+
 
 # Create a global instance of the cache service
 cache_service = CacheService()
@@ -1,12 +1,16 @@
 """Service for interacting with the Carbon Intensity API."""
 
+import asyncio
 import logging
+import time
 import httpx
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from typing import Dict
+from functools import lru_cache
+from typing import Awaitable, Dict, Iterable, List, Optional, TypeVar
 
 from app.config import settings
-from app.models.carbon import CarbonIntensityPeriod, CarbonForecast
+from app.models.carbon import CarbonIndex, CarbonIntensityPeriod, CarbonForecast
 from app.services.cache_service import cache_service
 from app.utils.exceptions import (
     CarbonAPIUnavailableError,
@@ -15,10 +19,139 @@ from app.utils.exceptions import (
 from app.utils.time_utils import (
     get_settlement_period,
     datetime_from_period,
+    seconds_until_next_period,
 )
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp from the Carbon Intensity API.
+
+    Timestamps repeat heavily (each period's end is the next period's start,
+    and the same days are fetched repeatedly), so results are memoized.
+
+    Args:
+        value: Timestamp such as "2024-06-20T14:00Z"
+
+    Returns:
+        Timezone-aware datetime
+    """
+    return datetime.fromisoformat(value)
+
+
+def _forecast_ttl() -> int:
+    """
+    Get the time-to-live for cached forecast data.
+
+    Forecasts are republished every settlement period, so cached entries
+    expire shortly after the next half-hour boundary rather than a fixed
+    interval after they were fetched.
+
+    Returns:
+        Time-to-live in seconds
+    """
+    return int(seconds_until_next_period(time.time())) + settings.FORECAST_PUBLISH_DELAY
+
+
+def _dates_in_range(start_date: str, end_date: str) -> List[str]:
+    """
+    List the dates covered by a forecast range request.
+
+    The range is inclusive, may be given in either order and is limited to
+    MAX_FORECAST_DAYS days after the earlier date.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+
+    Returns:
+        Dates in YYYY-MM-DD format, in ascending order
+    """
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+    if start_dt > end_dt:
+        start_dt, end_dt = end_dt, start_dt
+
+    # Limit to maximum forecast days
+    max_days = settings.MAX_FORECAST_DAYS
+    if (end_dt - start_dt).days > max_days:
+        end_dt = start_dt + timedelta(days=max_days)
+
+    return [
+        (start_dt + timedelta(days=i)).isoformat()
+        for i in range((end_dt - start_dt).days + 1)
+    ]
+
+
+async def _gather_all(aws: Iterable[Awaitable[T]]) -> List[T]:
+    """
+    Run awaitables concurrently and wait for all of them to finish.
+
+    Unlike a plain asyncio.gather, a failure does not return early while the
+    other fetches are still running: every fetch completes (and caches its
+    result) before the first error is re-raised.
+
+    Args:
+        aws: Awaitables to run
+
+    Returns:
+        Results in the same order as the awaitables
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedPeriod:
+    """
+    Lightweight record of a validated carbon intensity period.
+
+    Cached forecasts store these instead of Pydantic models or dumped dicts;
+    Pydantic objects are only built from them at the API boundary.
+    """
+
+    period: int
+    start_time: datetime
+    end_time: datetime
+    intensity_forecast: int
+    intensity_actual: Optional[int]
+    intensity_index: CarbonIndex
+
+    @classmethod
+    def from_model(cls, period: CarbonIntensityPeriod) -> "_CachedPeriod":
+        """Create a record from a validated CarbonIntensityPeriod."""
+        return cls(
+            period.period,
+            period.start_time,
+            period.end_time,
+            period.intensity_forecast,
+            period.intensity_actual,
+            period.intensity_index,
+        )
+
+    def to_model(self) -> CarbonIntensityPeriod:
+        """Build a CarbonIntensityPeriod without re-running validation."""
+        return CarbonIntensityPeriod.model_construct(
+            period=self.period,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            intensity_forecast=self.intensity_forecast,
+            intensity_actual=self.intensity_actual,
+            intensity_index=self.intensity_index,
+        )
+
 
 class CarbonIntensityService:
     """Service for fetching and processing carbon intensity data."""
@@ -29,6 +162,34 @@ class CarbonIntensityService:
         self.timeout = settings.CARBON_INTENSITY_TIMEOUT
         self.use_cache = use_cache
 
+        # Shared client, created on first use by _get_client
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Day forecasts currently being fetched, keyed by date
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it if there is none open.
+
+        Requests reuse its pooled keep-alive connections; the base URL is
+        parsed once here and requests pass only the path. A client closed at
+        the end of one app lifespan is replaced on the next request.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+                headers={"Accept": "application/json"},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the HTTP client and release its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+
     async def get_cache(self, cache_key) -> str | None:
         """
         Retrieve data from cache if available and caching is enabled.
@@ -61,78 +222,80 @@ class CarbonIntensityService:
             CarbonAPIUnavailableError: If the Carbon API is unavailable
             CarbonAPIResponseError: If the response is invalid
         """
-        cache_key = cache_service.get_carbon_forecast_key(date_str, [period])
+        cache_key = cache_service.get_carbon_forecast_key(date_str, (period,))
         cached_data = await self.get_cache(cache_key)
 
         if cached_data:
             logger.debug(f"Cache hit for {cache_key}")
             start_time, end_time = datetime_from_period(date_str, period)
-            return CarbonIntensityPeriod(
+            # Cached data was validated when fetched, so skip re-validation
+            return CarbonIntensityPeriod.model_construct(
                 period=period,
                 start_time=start_time,
                 end_time=end_time,
                 intensity_forecast=cached_data["forecast"],
                 intensity_actual=cached_data.get("actual"),
-                intensity_index=cached_data["index"],
+                intensity_index=CarbonIndex(cached_data["index"]),
             )
 
         # Fetch from API
-        url = f"{self.base_url}/intensity/date/{date_str}/{period}"
+        url = f"/intensity/date/{date_str}/{period}"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url, timeout=self.timeout, headers={"Accept": "application/json"}
-                )
-
-                if response.status_code != 200:
-                    error_msg = f"Carbon API returned status {response.status_code}"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg, response.status_code)
-
-                data = response.json()
-
-                if "error" in data:
-                    error_msg = f"Carbon API error: {data['error']['message']}"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg)
-
-                if (
-                    not data.get("data")
-                    or not isinstance(data["data"], list)
-                    or len(data["data"]) == 0
-                ):
-                    error_msg = "Invalid data format from Carbon API"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg)
-
-                # Process the response
-                period_data = data["data"][0]
-                start_time = datetime.fromisoformat(
-                    period_data["from"].replace("Z", "+00:00")
-                )
-                end_time = datetime.fromisoformat(
-                    period_data["to"].replace("Z", "+00:00")
-                )
-
-                intensity_data = period_data["intensity"]
-                forecast = intensity_data["forecast"]
-                actual = intensity_data.get("actual")
-                index = intensity_data["index"]
+            response = await self._get_client().get(url)
+
+            if response.status_code != 200:
+                error_msg = f"Carbon API returned status {response.status_code}"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg, response.status_code)
+
+            data = response.json()
+
+            if "error" in data:
+                error_msg = f"Carbon API error: {data['error']['message']}"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg)
+
+            if (
+                not data.get("data")
+                or not isinstance(data["data"], list)
+                or len(data["data"]) == 0
+            ):
+                error_msg = "Invalid data format from Carbon API"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg)
+
+            # Process the response
+            period_data = data["data"][0]
+            start_time = _parse_iso(period_data["from"])
+            end_time = _parse_iso(period_data["to"])
+
+            intensity_data = period_data["intensity"]
+            forecast = intensity_data["forecast"]
+            actual = intensity_data.get("actual")
+            index = intensity_data["index"]
+
+            result = CarbonIntensityPeriod(
+                period=period,
+                start_time=start_time,
+                end_time=end_time,
+                intensity_forecast=forecast,
+                intensity_actual=actual,
+                intensity_index=index,
+            )
 
-                # Cache the data
-                await cache_service.set(
-                    cache_key, {"forecast": forecast, "actual": actual, "index": index}
-                )
+            # Cache the validated data only, so cache hits can skip validation
+            await cache_service.set(
+                cache_key,
+                {
+                    "forecast": result.intensity_forecast,
+                    "actual": result.intensity_actual,
+                    "index": result.intensity_index,
+                },
+                ttl_seconds=_forecast_ttl(),
+            )
 
-                return CarbonIntensityPeriod(
-                    period=period,
-                    start_time=start_time,
-                    end_time=end_time,
-                    intensity_forecast=forecast,
-                    intensity_actual=actual,
-                    intensity_index=index,
-                )
+            return result
 
         except httpx.TimeoutException:
             error_msg = "Carbon API request timed out"
@@ -163,91 +326,111 @@ class CarbonIntensityService:
 
         if cached_data:
             logger.debug(f"Cache hit for {cache_key}")
-            return CarbonForecast(
+            # Cached data was validated when fetched, so skip re-validation
+            return CarbonForecast.model_construct(
                 date=date_str,
-                forecast_periods=[
-                    CarbonIntensityPeriod(**period_data)
-                    for period_data in cached_data["periods"]
-                ],
-                data_freshness=datetime.fromisoformat(cached_data["freshness"]),
+                forecast_periods=[p.to_model() for p in cached_data["periods"]],
+                data_freshness=cached_data["freshness"],
             )
 
-        # Fetch from API
-        url = f"{self.base_url}/intensity/date/{date_str}"
+        # Fetch from API, sharing one request between concurrent callers
+        fetch = self._inflight.get(date_str)
+        if fetch is None:
+            fetch = asyncio.ensure_future(
+                self._fetch_intensity_for_date(date_str, cache_key)
+            )
+            self._inflight[date_str] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(date_str, None))
+
+        # Shielded so that a cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(fetch)
+
+    async def _fetch_intensity_for_date(
+        self, date_str: str, cache_key: str
+    ) -> CarbonForecast:
+        """
+        Fetch the carbon intensity forecast for an entire day and cache it.
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+            cache_key: Cache key to store the forecast under
+
+        Returns:
+            CarbonForecast object
+
+        Raises:
+            CarbonAPIUnavailableError: If the Carbon API is unavailable
+            CarbonAPIResponseError: If the response is invalid
+        """
+        url = f"/intensity/date/{date_str}"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url, timeout=self.timeout, headers={"Accept": "application/json"}
-                )
+            response = await self._get_client().get(url)
+
+            if response.status_code != 200:
+                error_msg = f"Carbon API returned status {response.status_code}"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg, response.status_code)
+
+            data = response.json()
+
+            if "error" in data:
+                error_msg = f"Carbon API error: {data['error']['message']}"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg)
+
+            if (
+                not data.get("data")
+                or not isinstance(data["data"], list)
+                or len(data["data"]) == 0
+            ):
+                error_msg = "Invalid data format from Carbon API"
+                logger.error(error_msg)
+                raise CarbonAPIResponseError(error_msg)
+
+            # Process the response
+            periods = []
+            for period_data in data["data"]:
+                start_time = _parse_iso(period_data["from"])
+                end_time = _parse_iso(period_data["to"])
+                period = get_settlement_period(start_time)
 
-                if response.status_code != 200:
-                    error_msg = f"Carbon API returned status {response.status_code}"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg, response.status_code)
-
-                data = response.json()
-
-                if "error" in data:
-                    error_msg = f"Carbon API error: {data['error']['message']}"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg)
-
-                if (
-                    not data.get("data")
-                    or not isinstance(data["data"], list)
-                    or len(data["data"]) == 0
-                ):
-                    error_msg = "Invalid data format from Carbon API"
-                    logger.error(error_msg)
-                    raise CarbonAPIResponseError(error_msg)
-
-                # Process the response
-                periods = []
-                for period_data in data["data"]:
-                    start_time = datetime.fromisoformat(
-                        period_data["from"].replace("Z", "+00:00")
-                    )
-                    end_time = datetime.fromisoformat(
-                        period_data["to"].replace("Z", "+00:00")
-                    )
-                    period = get_settlement_period(start_time)
-
-                    intensity_data = period_data["intensity"]
-                    forecast = intensity_data["forecast"]
-                    actual = intensity_data.get("actual")
-                    index = intensity_data["index"]
-
-                    periods.append(
-                        CarbonIntensityPeriod(
-                            period=period,
-                            start_time=start_time,
-                            end_time=end_time,
-                            intensity_forecast=forecast,
-                            intensity_actual=actual,
-                            intensity_index=index,
-                        )
+                intensity_data = period_data["intensity"]
+                forecast = intensity_data["forecast"]
+                actual = intensity_data.get("actual")
+                index = intensity_data["index"]
+
+                periods.append(
+                    CarbonIntensityPeriod(
+                        period=period,
+                        start_time=start_time,
+                        end_time=end_time,
+                        intensity_forecast=forecast,
+                        intensity_actual=actual,
+                        intensity_index=index,
                     )
+                )
 
-                # Sort periods by period number
-                periods.sort(key=lambda p: p.period)
+            # Sort periods by period number
+            periods.sort(key=lambda p: p.period)
 
-                # Create the forecast object
-                now = datetime.now(UTC)
-                forecast = CarbonForecast(
-                    date=date_str, forecast_periods=periods, data_freshness=now
-                )
+            # Create the forecast object
+            now = datetime.now(UTC)
+            forecast = CarbonForecast(
+                date=date_str, forecast_periods=periods, data_freshness=now
+            )
 
-                # Cache the data
-                await cache_service.set(
-                    cache_key,
-                    {
-                        "periods": [p.model_dump() for p in periods],
-                        "freshness": now.isoformat(),
-                    },
-                )
+            # Cache the data
+            await cache_service.set(
+                cache_key,
+                {
+                    "periods": tuple(_CachedPeriod.from_model(p) for p in periods),
+                    "freshness": now,
+                },
+                ttl_seconds=_forecast_ttl(),
+            )
 
-                return forecast
+            return forecast
 
         except httpx.TimeoutException:
             error_msg = "Carbon API request timed out"
@@ -258,6 +441,53 @@ class CarbonIntensityService:
             logger.error(error_msg)
             raise CarbonAPIUnavailableError(error_msg)
 
+    async def get_intensity_for_date_json(self, date_str: str) -> bytes:
+        """
+        Get carbon intensity forecast for an entire day as serialized JSON.
+
+        The serialized forecast is cached separately so that repeated HTTP
+        requests for the same date can be answered without rebuilding or
+        re-serializing any Pydantic models.
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+
+        Returns:
+            JSON-encoded CarbonForecast
+
+        Raises:
+            CarbonAPIUnavailableError: If the Carbon API is unavailable
+            CarbonAPIResponseError: If the response is invalid
+        """
+        cache_key = cache_service.get_carbon_forecast_json_key(date_str)
+        cached_json = await self.get_cache(cache_key)
+
+        if cached_json:
+            logger.debug(f"Cache hit for {cache_key}")
+            return cached_json
+
+        forecast = await self.get_intensity_for_date(date_str)
+        forecast_json = forecast.model_dump_json().encode()
+
+        # Cache the serialized forecast
+        await cache_service.set(cache_key, forecast_json, ttl_seconds=_forecast_ttl())
+
+        return forecast_json
+
+    async def warm_cache(self) -> None:
+        """
+        Pre-fetch today's and tomorrow's forecasts into the cache.
+
+        Raises:
+            CarbonAPIUnavailableError: If the Carbon API is unavailable
+            CarbonAPIResponseError: If the response is invalid
+        """
+        today = datetime.now(UTC).date()
+        date_strs = [(today + timedelta(days=i)).isoformat() for i in range(2)]
+        await _gather_all(
+            self.get_intensity_for_date_json(date_str) for date_str in date_strs
+        )
+
     async def get_intensity_for_date_range(
         self, start_date: str, end_date: str
     ) -> Dict[str, CarbonForecast]:
@@ -275,27 +505,50 @@ class CarbonIntensityService:
             CarbonAPIUnavailableError: If the Carbon API is unavailable
             CarbonAPIResponseError: If the response is invalid
         """
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        date_strs = _dates_in_range(start_date, end_date)
+
+        # Fetch all days concurrently rather than one round-trip at a time
+        forecasts = await _gather_all(
+            self.get_intensity_for_date(date_str) for date_str in date_strs
+        )
 
-        if start_dt > end_dt:
-            start_dt, end_dt = end_dt, start_dt
+        return dict(zip(date_strs, forecasts))
 
-        # Limit to maximum forecast days
-        max_days = settings.MAX_FORECAST_DAYS
-        if (end_dt - start_dt).days > max_days:
-            end_dt = start_dt + timedelta(days=max_days)
+    async def get_intensity_for_date_range_json(
+        self, start_date: str, end_date: str
+    ) -> bytes:
+        """
+        Get carbon intensity forecasts for a range of dates as serialized JSON.
 
-        result = {}
-        current_dt = start_dt
+        The response is assembled from the cached per-day JSON, so no Pydantic
+        models are built or serialized for days that are already cached.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
 
-        while current_dt <= end_dt:
-            date_str = current_dt.strftime("%Y-%m-%d")
-            forecast = await self.get_intensity_for_date(date_str)
-            result[date_str] = forecast
-            current_dt += timedelta(days=1)
+        Returns:
+            JSON object mapping date strings to CarbonForecast objects
 
-        return result
+        Raises:
+            CarbonAPIUnavailableError: If the Carbon API is unavailable
+            CarbonAPIResponseError: If the response is invalid
+        """
+        date_strs = _dates_in_range(start_date, end_date)
+
+        forecast_jsons = await _gather_all(
+            self.get_intensity_for_date_json(date_str) for date_str in date_strs
+        )
+
+        # Dates come from date.isoformat, so they never need JSON escaping
+        return (
+            b"{"
+            + b",".join(
+                b'"%s":%s' % (date_str.encode(), forecast_json)
+                for date_str, forecast_json in zip(date_strs, forecast_jsons)
+            )
+            + b"}"
+        )
 
 
 # Create a global instance of the carbon intensity service
@@ -1,13 +1,19 @@
 """Service for scheduling batch jobs during periods of low carbon intensity."""
 
+import heapq
 import logging
-from datetime import datetime, timedelta, UTC
-from typing import List, Tuple, Dict
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, UTC
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.config import settings
 from app.models.scheduling import (
     JobScheduleRequest,
     JobScheduleResponse,
+    SchedulingMode,
     TimeSlot,
     SchedulingMetadata,
 )
@@ -17,13 +23,32 @@ from app.utils.exceptions import (
     InvalidScheduleRequestError,
     NoViableTimeSlotError,
 )
-from app.utils.time_utils import (
-    get_date_periods_between,
-    generate_time_windows,
-)
+from app.utils.time_utils import count_time_windows
 
 logger = logging.getLogger(__name__)
 
+# Length of a settlement period
+_HALF_HOUR = timedelta(minutes=30)
+
+# Upper bounds (inclusive, gCO2/kWh) of each carbon index category but the last
+_CARBON_INDEX_THRESHOLDS = (100, 150, 250, 350)
+_CARBON_INDEX_VALUES = (
+    CarbonIndex.VERY_LOW,
+    CarbonIndex.LOW,
+    CarbonIndex.MODERATE,
+    CarbonIndex.HIGH,
+    CarbonIndex.VERY_HIGH,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _DayForecast:
+    """A day's forecast intensities, stored as parallel arrays."""
+
+    periods: array
+    intensities: array
+    data_freshness: datetime
+
 
 class ScheduleService:
     """Service for scheduling batch jobs during periods of low carbon intensity."""
@@ -42,11 +67,13 @@ class ScheduleService:
             InvalidScheduleRequestError: If the request is invalid
             NoViableTimeSlotError: If no viable time slot can be found
         """
+        # Read the clock once; every check and window below is relative to it
+        now = datetime.now(UTC)
+
         # Validate the request
-        self._validate_request(request)
+        self._validate_request(request, now)
 
         # Calculate the earliest start time (now) and latest end time (deadline)
-        now = datetime.now(UTC)
         deadline = request.deadline_utc
         job_duration = timedelta(minutes=request.job_duration_minutes)
 
@@ -56,44 +83,53 @@ class ScheduleService:
                 f"Job duration ({request.job_duration_minutes} minutes) exceeds available time before deadline"
             )
 
-        # Generate all possible time windows for the job
-        time_windows = generate_time_windows(
+        # Count the possible time windows for the job; window k starts k
+        # half-hours after now, so datetimes are only built for the results
+        window_count, window_delta = count_time_windows(
             start_dt=now, end_dt=deadline, window_minutes=request.job_duration_minutes
         )
 
-        if not time_windows:
+        if not window_count:
             raise NoViableTimeSlotError("No viable time slots found for the job")
 
+        last_end = now + (window_count - 1) * _HALF_HOUR + window_delta
+
         # Get carbon intensity data for all relevant periods
-        carbon_data = await self._get_carbon_data_for_windows(time_windows)
+        carbon_data = await self._get_carbon_data_for_windows(now, last_end)
 
         # Calculate average carbon intensity for each window
-        window_intensities = []
-        for start_time, end_time in time_windows:
-            avg_intensity = self._calculate_window_intensity(
-                start_time, end_time, carbon_data
-            )
-            window_intensities.append((start_time, end_time, avg_intensity))
-
-        # Sort windows by carbon intensity (lowest first)
-        window_intensities.sort(key=lambda x: x[2])
+        averages = self._calculate_window_intensities(
+            now, window_delta, window_count, carbon_data
+        )
 
         # Select optimal and alternative slots
+        ranked = self._select_windows(averages, request.mode)
+
+        if not ranked:
+            raise NoViableTimeSlotError(
+                "No carbon intensity data available for the job's time windows"
+            )
+
+        window_intensities = [
+            (now + i * _HALF_HOUR, now + i * _HALF_HOUR + window_delta, avg)
+            for avg, i in ranked
+        ]
         optimal_window = window_intensities[0]
-        alternative_windows = window_intensities[1 : settings.MAX_ALTERNATIVE_SLOTS + 1]
+        alternative_windows = window_intensities[1:]
 
         # Calculate metadata
-        periods_analyzed = sum(len(periods) for periods in carbon_data.values())
-        cached_data_age = self._calculate_cached_data_age(carbon_data)
+        periods_analyzed = sum(len(day.periods) for day in carbon_data.values())
+        cached_data_age = self._calculate_cached_data_age(carbon_data, now)
 
-        # Prepare the response
-        return JobScheduleResponse(
+        # Prepare the response; every value is built here with the right
+        # type, so validation is skipped
+        return JobScheduleResponse.model_construct(
             optimal_start_time=optimal_window[0],
             optimal_end_time=optimal_window[1],
             carbon_intensity=optimal_window[2],
             carbon_index=self._get_carbon_index(optimal_window[2]),
             alternative_slots=[
-                TimeSlot(
+                TimeSlot.model_construct(
                     start_time=start,
                     end_time=end,
                     carbon_intensity=intensity,
@@ -101,19 +137,53 @@ class ScheduleService:
                 )
                 for start, end, intensity in alternative_windows
             ],
-            scheduling_metadata=SchedulingMetadata(
+            scheduling_metadata=SchedulingMetadata.model_construct(
                 periods_analyzed=periods_analyzed,
-                forecast_confidence=self._get_forecast_confidence(optimal_window[0]),
+                forecast_confidence=self._get_forecast_confidence(
+                    optimal_window[0], now
+                ),
                 cached_data_age_minutes=cached_data_age,
             ),
         )
 
-    def _validate_request(self, request: JobScheduleRequest) -> None:
+    def _select_windows(
+        self, averages: Iterable[Optional[int]], mode: SchedulingMode
+    ) -> List[Tuple[int, int]]:
+        """
+        Pick the windows to return, best first.
+
+        In optimal mode these are the lowest-intensity windows with forecast
+        data, earlier windows first on ties. Only these few are needed, so a
+        partial sort is enough. In first-green mode the scan stops at the
+        earliest very low intensity window, which is returned alone; if there
+        is none, the optimal selection is used instead.
+
+        Args:
+            averages: Average carbon intensity for each window, in time order
+            mode: How to pick the windows
+
+        Returns:
+            List of (average intensity, window index) tuples
+        """
+        scored = ((avg, i) for i, avg in enumerate(averages) if avg is not None)
+
+        if mode == SchedulingMode.FIRST_GREEN:
+            seen = []
+            for avg, i in scored:
+                if avg <= _CARBON_INDEX_THRESHOLDS[0]:
+                    return [(avg, i)]
+                seen.append((avg, i))
+            scored = seen
+
+        return heapq.nsmallest(settings.MAX_ALTERNATIVE_SLOTS + 1, scored)
+
+    def _validate_request(self, request: JobScheduleRequest, now: datetime) -> None:
         """
         Validate a job scheduling request.
 
         Args:
             request: The job scheduling request
+            now: Current time (UTC)
 
         Raises:
             InvalidScheduleRequestError: If the request is invalid
@@ -130,91 +200,112 @@ class ScheduleService:
             )
 
         # Check deadline
-        if request.deadline_utc <= datetime.now(UTC):
+        if request.deadline_utc <= now:
             raise InvalidScheduleRequestError("Deadline must be in the future")
 
     async def _get_carbon_data_for_windows(
-        self, windows: List[Tuple[datetime, datetime]]
-    ) -> Dict[str, List[Dict]]:
+        self, first_start: datetime, last_end: datetime
+    ) -> Dict[str, _DayForecast]:
         """
         Get carbon intensity data for all time windows.
 
         Args:
-            windows: List of (start_time, end_time) tuples
+            first_start: Start time of the earliest window
+            last_end: End time of the latest window
 
         Returns:
-            Dictionary mapping date strings to lists of carbon intensity data
+            Dictionary mapping date strings to that day's forecast intensities
         """
         # Find the earliest start and latest end dates
-        start_date = min(window[0] for window in windows).date()
-        end_date = max(window[1] for window in windows).date()
+        start_date = first_start.date()
+        end_date = last_end.date()
 
-        # Convert to string format
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
+        # Convert to string format (YYYY-MM-DD)
+        start_date_str = start_date.isoformat()
+        end_date_str = end_date.isoformat()
 
         # Get forecasts for the date range
         forecasts = await carbon_service.get_intensity_for_date_range(
             start_date_str, end_date_str
         )
 
-        # Organize by date for easier lookup
+        # Organize by date as flat arrays, keeping only what window scoring
+        # reads
         result = {}
         for date_str, forecast in forecasts.items():
-            result[date_str] = [
-                {
-                    "period": p.period,
-                    "start_time": p.start_time,
-                    "end_time": p.end_time,
-                    "intensity": p.intensity_forecast,
-                    "index": p.intensity_index,
-                }
-                for p in forecast.forecast_periods
-            ]
+            periods = forecast.forecast_periods
+            result[date_str] = _DayForecast(
+                periods=array("l", [p.period for p in periods]),
+                intensities=array("l", [p.intensity_forecast for p in periods]),
+                data_freshness=forecast.data_freshness,
+            )
 
         return result
 
-    def _calculate_window_intensity(
+    def _calculate_window_intensities(
         self,
-        start_time: datetime,
-        end_time: datetime,
-        carbon_data: Dict[str, List[Dict]],
-    ) -> int:
+        first_start: datetime,
+        window_delta: timedelta,
+        window_count: int,
+        carbon_data: Dict[str, _DayForecast],
+    ) -> Iterator[Optional[int]]:
         """
-        Calculate the average carbon intensity for a time window.
+        Calculate the average carbon intensity for every time window.
+
+        The forecast is laid out as flat arrays over a half-hourly timeline
+        starting at midnight of the first window, so the total for a window is
+        the difference of two prefix sums rather than a scan over its periods.
+        Windows start 30 minutes apart, so window k starts k periods after the
+        first one.
 
         Args:
-            start_time: Start time of the window
-            end_time: End time of the window
+            first_start: Start time of the first window
+            window_delta: Duration of each window (a multiple of 30 minutes)
+            window_count: Number of windows
             carbon_data: Dictionary of carbon intensity data
 
         Returns:
-            Average carbon intensity for the window (gCO2/kWh)
+            Average carbon intensity for each window (gCO2/kWh), or None for
+            windows with no forecast data, computed lazily in time order
         """
-        # Get all periods that overlap with the window
-        date_periods = get_date_periods_between(start_time, end_time)
-
-        total_intensity = 0
-        period_count = 0
-
-        for date_str, periods in date_periods.items():
-            if date_str not in carbon_data:
-                continue
-
-            date_carbon_data = carbon_data[date_str]
-
-            # Map periods to their data for easy lookup
-            period_map = {p["period"]: p for p in date_carbon_data}
-
-            for period in periods:
-                if period in period_map:
-                    total_intensity += period_map[period]["intensity"]
-                    period_count += 1
-
-        if period_count == 0:
-            raise NoViableTimeSlotError()
-
-        return total_intensity // period_count
+        timeline_start = datetime.combine(
+            first_start.date(), time.min, tzinfo=first_start.tzinfo
+        )
+        window_periods = window_delta // _HALF_HOUR
+        first_offset = (first_start - timeline_start) // _HALF_HOUR
+        timeline_periods = first_offset + window_count - 1 + window_periods
+
+        # Intensity per half-hour and whether a forecast exists for it
+        intensities = array("l", [0]) * timeline_periods
+        has_data = array("l", [0]) * timeline_periods
+        for date_str, day in carbon_data.items():
+            offset = (date.fromisoformat(date_str) - timeline_start.date()).days * 48
+            for period, intensity in zip(day.periods, day.intensities):
+                index = offset + period - 1
+                if 0 <= index < timeline_periods:
+                    intensities[index] = intensity
+                    has_data[index] = 1
+
+        intensity_sums = [0, *accumulate(intensities)]
+        data_counts = [0, *accumulate(has_data)]
+
+        # Window k spans prefix entries first_offset + k up to that plus
+        # window_periods, so pair up two shifted slices of each prefix array
+        # rather than indexing them per window
+        firsts = slice(first_offset, first_offset + window_count)
+        lasts = slice(firsts.start + window_periods, firsts.stop + window_periods)
+
+        return (
+            (sum_last - sum_first) // (count_last - count_first)
+            if count_last != count_first
+            else None
+            for sum_first, sum_last, count_first, count_last in zip(
+                intensity_sums[firsts],
+                intensity_sums[lasts],
+                data_counts[firsts],
+                data_counts[lasts],
+            )
+        )
 
     def _get_carbon_index(self, intensity: int) -> CarbonIndex:
         """
@@ -226,28 +317,20 @@ class ScheduleService:
         Returns:
             CarbonIndex category
         """
-        if intensity <= 100:
-            return CarbonIndex.VERY_LOW
-        elif intensity <= 150:
-            return CarbonIndex.LOW
-        elif intensity <= 250:
-            return CarbonIndex.MODERATE
-        elif intensity <= 350:
-            return CarbonIndex.HIGH
-        else:
-            return CarbonIndex.VERY_HIGH
+        return _CARBON_INDEX_VALUES[bisect_left(_CARBON_INDEX_THRESHOLDS, intensity)]
 
-    def _get_forecast_confidence(self, start_time: datetime) -> str:
+    def _get_forecast_confidence(self, start_time: datetime, now: datetime) -> str:
         """
         Determine confidence level in the forecast based on how far in the future it is.
 
         Args:
             start_time: Start time of the job
+            now: Current time (UTC)
 
         Returns:
             Confidence level string (high, medium, low)
         """
-        hours_in_future = (start_time - datetime.now(UTC)).total_seconds() / 3600
+        hours_in_future = (start_time - now).total_seconds() / 3600
 
         if hours_in_future <= 12:
             return "high"
@@ -256,23 +339,27 @@ class ScheduleService:
         else:
             return "low"
 
-    def _calculate_cached_data_age(self, carbon_data: Dict[str, List[Dict]]) -> int:
+    def _calculate_cached_data_age(
+        self, carbon_data: Dict[str, _DayForecast], now: datetime
+    ) -> int:
         """
-        Get the age of the cached carbon data in minutes.
+        Get the age of the carbon data in minutes.
 
-        Note: Current implementation returns a fixed default value.
-        In a production environment, this would track when the data was
-        last fetched from the API.
+        Days may have been fetched at different times, so this is the age of
+        the oldest day's forecast.
 
         Args:
             carbon_data: Dictionary of carbon intensity data
+            now: Current time (UTC)
 
         Returns:
-            Age of the data in minutes (currently fixed at 15 minutes)
+            Age of the data in whole minutes
         """
-        # For now, we'll just return a default value
-        # In a real implementation, we would track when the data was fetched
-        return 15
+        if not carbon_data:
+            return 0
+
+        oldest = min(day.data_freshness for day in carbon_data.values())
+        return max(0, (now - oldest) // timedelta(minutes=1))
 
 
 # Create a global instance of the schedule service
@@ -2,17 +2,24 @@
 
 
 class GreenScheduleException(Exception):
-    """Base exception class for the Green Time Schedule API."""
+    """
+    Base exception class for the Green Time Schedule API.
 
-    pass
+    The message is not stored as an attribute; it is read back from the
+    exception args.
+    """
+
+    @property
+    def message(self) -> str:
+        """The error message."""
+        return self.args[0] if self.args else ""
 
 
 class CarbonAPIUnavailableError(GreenScheduleException):
     """Raised when the Carbon Intensity API is unavailable."""
 
     def __init__(self, message="Carbon Intensity API is currently unavailable"):
-        self.message = message
-        super().__init__(self.message)
+        super().__init__(message)
 
 
 class CarbonAPIResponseError(GreenScheduleException):
@@ -21,30 +28,26 @@ class CarbonAPIResponseError(GreenScheduleException):
     def __init__(
         self, message="Error in Carbon Intensity API response", status_code=None
     ):
-        self.message = message
         self.status_code = status_code
-        super().__init__(self.message)
+        super().__init__(message)
 
 
 class InvalidScheduleRequestError(GreenScheduleException):
     """Raised when the job scheduling request is invalid."""
 
     def __init__(self, message="Invalid job scheduling request"):
-        self.message = message
-        super().__init__(self.message)
+        super().__init__(message)
 
 
 class NoViableTimeSlotError(GreenScheduleException):
     """Raised when no viable time slot can be found for the job."""
 
     def __init__(self, message="No viable time slot found for the job"):
-        self.message = message
-        super().__init__(self.message)
+        super().__init__(message)
 
 
 class CacheError(GreenScheduleException):
     """Raised when there is an error with the cache."""
 
     def __init__(self, message="Error with the cache"):
-        self.message = message
-        super().__init__(self.message)
+        super().__init__(message)
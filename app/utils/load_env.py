@@ -1,16 +1,29 @@
 """Utility for loading environment variables from .env files."""
 
+import logging
 import os
+from functools import lru_cache
 from pathlib import Path
+
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Determine the project root directory
 project_root = Path(__file__).parent.parent.parent.absolute()
 
-# Load environment variables from .env file
-env_file = os.path.join(project_root, ".env")
-if os.path.exists(env_file):
-    load_dotenv(env_file)
-    print(f"Loaded environment variables from {env_file}")
-else:
-    print(f"No .env file found at {env_file}, using default values")
+
+@lru_cache(maxsize=1)
+def ensure_env_loaded() -> None:
+    """
+    Load environment variables from the project's .env file, if present.
+
+    Only the first call does any work, so it is safe to call from anywhere
+    that reads the environment.
+    """
+    env_file = os.path.join(project_root, ".env")
+    if os.path.exists(env_file):
+        load_dotenv(env_file)
+        logger.info(f"Loaded environment variables from {env_file}")
+    else:
+        logger.info(f"No .env file found at {env_file}, using default values")
@@ -1,8 +1,15 @@
 """Time-related utility functions for the Green Time Schedule API."""
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from typing import List, Tuple, Dict
 
+# Length of a settlement period in seconds
+PERIOD_SECONDS = 1800
+
+# Length of a settlement period
+_PERIOD = timedelta(seconds=PERIOD_SECONDS)
+
 
 def get_settlement_period(dt: datetime) -> int:
     """
@@ -21,10 +28,13 @@ def get_settlement_period(dt: datetime) -> int:
     return period
 
 
+@lru_cache(maxsize=4096)
 def datetime_from_period(date_str: str, period: int) -> Tuple[datetime, datetime]:
     """
     Convert a date string and settlement period to start and end datetimes.
 
+    Results are cached, since the same few dates are looked up repeatedly.
+
     Args:
         date_str: Date in YYYY-MM-DD format
         period: Settlement period (1-48)
@@ -33,16 +43,14 @@ def datetime_from_period(date_str: str, period: int) -> Tuple[datetime, datetime
         Tuple of (start_datetime, end_datetime)
     """
     # Convert period to hours and minutes
-    minutes_since_midnight = (period - 1) * 30
-    hours = minutes_since_midnight // 60
-    minutes = minutes_since_midnight % 60
+    hours, minutes = divmod((period - 1) * 30, 60)
 
-    # Create start datetime
-    start_date = datetime.strptime(date_str, "%Y-%m-%d")
-    start_dt = start_date.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    # Create start datetime; date.fromisoformat is much cheaper than strptime
+    day = date.fromisoformat(date_str)
+    start_dt = datetime(day.year, day.month, day.day, hours, minutes)
 
     # End datetime is 30 minutes later
-    end_dt = start_dt + timedelta(minutes=30)
+    end_dt = start_dt + _PERIOD
 
     return (start_dt, end_dt)
 
@@ -53,6 +61,12 @@ def get_date_periods_between(
     """
     Get all date and period combinations between two datetimes.
 
+    A period is included if any part of it falls within [start_dt, end_dt),
+    so an unaligned range includes the partly covered periods at both ends.
+    The scheduler does not use this: it scores a window over the periods
+    stepped from the one its start falls in, one per half-hour of the
+    window, so it leaves out a partly covered period at the end.
+
     Args:
         start_dt: Start datetime
         end_dt: End datetime
@@ -64,35 +78,33 @@ def get_date_periods_between(
         return {}
 
     result = {}
-    current_dt = start_dt
-
-    while current_dt < end_dt:
-        date_str = current_dt.strftime("%Y-%m-%d")
-        period = get_settlement_period(current_dt)
+    current_date = start_dt.date()
 
-        if date_str not in result:
-            result[date_str] = []
+    while current_date <= end_dt.date():
+        day_start = datetime.combine(current_date, time.min, tzinfo=start_dt.tzinfo)
 
-        if period not in result[date_str]:
-            result[date_str].append(period)
+        # First period starting at or before start_dt, and the number of
+        # periods starting before end_dt (ceiling division)
+        first = max(0, (start_dt - day_start) // _PERIOD)
+        last = min(48, -((day_start - end_dt) // _PERIOD))
 
-        # Move to next period (30 minutes later)
-        current_dt += timedelta(minutes=30)
+        if first < last:
+            result[current_date.isoformat()] = list(range(first + 1, last + 1))
 
-        # Handle case where we cross midnight
-        if current_dt.date() != start_dt.date() and len(result[date_str]) < 48:
-            # Fill in remaining periods for the day if needed
-            missing_periods = [p for p in range(1, 49) if p not in result[date_str]]
-            result[date_str].extend(missing_periods)
+        current_date += timedelta(days=1)
 
     return result
 
 
-def generate_time_windows(
+def count_time_windows(
     start_dt: datetime, end_dt: datetime, window_minutes: int
-) -> List[Tuple[datetime, datetime]]:
+) -> Tuple[int, timedelta]:
     """
-    Generate all possible time windows of specified duration between start and end times.
+    Count the time windows of specified duration between start and end times.
+
+    Windows start at start_dt and then every 30 minutes, and must end by
+    end_dt. The count is computed directly, so callers can work with window
+    indices and only build datetimes for the windows they need.
 
     Args:
         start_dt: Start datetime
@@ -100,7 +112,8 @@ def generate_time_windows(
         window_minutes: Duration of the window in minutes
 
     Returns:
-        List of (window_start, window_end) tuples
+        Tuple of (number of windows, window duration rounded up to a multiple
+        of 30 minutes)
     """
     if window_minutes < 30:
         window_minutes = 30  # Minimum window size is 30 minutes
@@ -110,19 +123,55 @@ def generate_time_windows(
 
     window_delta = timedelta(minutes=window_minutes)
     if start_dt + window_delta > end_dt:
-        return []  # Not enough time for even one window
+        return 0, window_delta  # Not enough time for even one window
 
-    windows = []
-    current_start = start_dt
+    spare_time = end_dt - start_dt - window_delta
+    return spare_time // _PERIOD + 1, window_delta
 
-    # Generate windows with 30-minute steps
-    while current_start + window_delta <= end_dt:
-        windows.append((current_start, current_start + window_delta))
-        current_start += timedelta(minutes=30)
 
-    return windows
+def generate_time_windows(
+    start_dt: datetime, end_dt: datetime, window_minutes: int
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Generate all possible time windows of specified duration between start and end times.
+
+    These are the windows count_time_windows counts, built as datetimes; the
+    scheduler itself works with the count and window indices instead.
+
+    Args:
+        start_dt: Start datetime
+        end_dt: End datetime
+        window_minutes: Duration of the window in minutes
+
+    Returns:
+        List of (window_start, window_end) tuples
+    """
+    window_count, window_delta = count_time_windows(start_dt, end_dt, window_minutes)
+
+    # Generate windows with 30-minute steps
+    return [
+        (start, start + window_delta)
+        for start in (start_dt + i * _PERIOD for i in range(window_count))
+    ]
 
 
 def format_datetime_iso(dt: datetime) -> str:
     """Format a datetime in ISO 8601 format with Z timezone designator."""
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Plain integer formatting avoids strftime's locale-aware C round trip
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
+
+
+def seconds_until_next_period(timestamp: float) -> float:
+    """
+    Get the number of seconds until the next settlement period boundary.
+
+    Args:
+        timestamp: Unix timestamp
+
+    Returns:
+        Seconds until the next half-hour boundary (greater than 0, at most 1800)
+    """
+    return PERIOD_SECONDS - timestamp % PERIOD_SECONDS
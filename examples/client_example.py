@@ -9,16 +9,20 @@ import json
 from datetime import datetime, timedelta
 import httpx
 
+# Base URL of the Green Time Schedule API
+API_BASE_URL = "http://localhost:8000/api/v1"
 
-async def schedule_job():
+
+async def schedule_job(client: httpx.AsyncClient):
     """Schedule a batch job using the Green Time Schedule API."""
-    # API endpoint
-    api_url = "http://localhost:8000/api/v1/schedule/job"
 
     # Calculate deadline (24 hours from now)
     now = datetime.utcnow()
     deadline = now + timedelta(hours=24)
-    deadline_str = deadline.strftime("%Y-%m-%dT%H:%M:%SZ")
+    deadline_str = (
+        f"{deadline.year:04d}-{deadline.month:02d}-{deadline.day:02d}"
+        f"T{deadline.hour:02d}:{deadline.minute:02d}:{deadline.second:02d}Z"
+    )
 
     # Prepare request data
     request_data = {
@@ -31,91 +35,99 @@ async def schedule_job():
     print(f"Scheduling job with data: {json.dumps(request_data, indent=2)}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(api_url, json=request_data)
-
-            if response.status_code == 200:
-                result = response.json()
-
-                print("\nJob successfully scheduled!")
-                print(f"Optimal start time: {result['optimal_start_time']}")
-                print(f"Optimal end time: {result['optimal_end_time']}")
-                print(
-                    f"Carbon intensity: {result['carbon_intensity']} gCO2/kWh ({result['carbon_index']})"
-                )
-
-                print("\nAlternative slots:")
-                for i, slot in enumerate(result["alternative_slots"], 1):
-                    print(
-                        f"  {i}. {slot['start_time']} to {slot['end_time']} - "
-                        f"{slot['carbon_intensity']} gCO2/kWh ({slot['carbon_index']})"
-                    )
-
-                print("\nScheduling metadata:")
-                metadata = result["scheduling_metadata"]
-                print(f"  Periods analyzed: {metadata['periods_analyzed']}")
-                print(f"  Forecast confidence: {metadata['forecast_confidence']}")
-                print(
-                    f"  Cached data age: {metadata['cached_data_age_minutes']} minutes"
-                )
-
-                return result
-            else:
-                print(f"Error: {response.status_code}")
-                print(response.text)
-                return None
+        response = await client.post("/schedule/job", json=request_data)
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Error scheduling job: {response.status_code}")
+            print(response.text)
+            return None
 
     except Exception as e:
         print(f"Error scheduling job: {str(e)}")
         return None
 
 
-async def get_carbon_forecast(date):
-    """Get carbon intensity forecast for a specific date."""
-    api_url = f"http://localhost:8000/api/v1/carbon/forecast/{date}"
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(api_url)
+def print_schedule(result):
+    """Print the result of a job scheduling request."""
+    print("\nJob successfully scheduled!")
+    print(f"Optimal start time: {result['optimal_start_time']}")
+    print(f"Optimal end time: {result['optimal_end_time']}")
+    print(
+        f"Carbon intensity: {result['carbon_intensity']} gCO2/kWh ({result['carbon_index']})"
+    )
 
-            if response.status_code == 200:
-                result = response.json()
+    print("\nAlternative slots:")
+    for i, slot in enumerate(result["alternative_slots"], 1):
+        print(
+            f"  {i}. {slot['start_time']} to {slot['end_time']} - "
+            f"{slot['carbon_intensity']} gCO2/kWh ({slot['carbon_index']})"
+        )
 
-                print(f"\nCarbon intensity forecast for {date}:")
-                print(f"Data freshness: {result['data_freshness']}")
+    print("\nScheduling metadata:")
+    metadata = result["scheduling_metadata"]
+    print(f"  Periods analyzed: {metadata['periods_analyzed']}")
+    print(f"  Forecast confidence: {metadata['forecast_confidence']}")
+    print(f"  Cached data age: {metadata['cached_data_age_minutes']} minutes")
 
-                # Show the first few periods
-                print("\nSample periods:")
-                for period in result["forecast_periods"][:5]:  # First 5 periods
-                    print(
-                        f"  Period {period['period']}: {period['start_time']} to {period['end_time']} - "
-                        f"{period['intensity_forecast']} gCO2/kWh ({period['intensity_index']})"
-                    )
 
-                print(f"  ... and {len(result['forecast_periods']) - 5} more periods")
+async def get_carbon_forecast(client: httpx.AsyncClient, date):
+    """Get carbon intensity forecast for a specific date."""
+    try:
+        response = await client.get(f"/carbon/forecast/{date}")
 
-                return result
-            else:
-                print(f"Error: {response.status_code}")
-                print(response.text)
-                return None
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Error getting forecast: {response.status_code}")
+            print(response.text)
+            return None
 
     except Exception as e:
         print(f"Error getting forecast: {str(e)}")
         return None
 
 
+def print_forecast(date, result):
+    """Print a carbon intensity forecast."""
+    print(f"\nCarbon intensity forecast for {date}:")
+    print(f"Data freshness: {result['data_freshness']}")
+
+    # Show the first few periods
+    print("\nSample periods:")
+    for period in result["forecast_periods"][:5]:  # First 5 periods
+        print(
+            f"  Period {period['period']}: {period['start_time']} to {period['end_time']} - "
+            f"{period['intensity_forecast']} gCO2/kWh ({period['intensity_index']})"
+        )
+
+    print(f"  ... and {len(result['forecast_periods']) - 5} more periods")
+
+
 async def main():
     """Main function to run the examples."""
     print("Green Time Schedule API Client Example")
     print("======================================")
 
-    # First, get carbon forecast for today
-    today = datetime.utcnow().strftime("%Y-%m-%d")
-    await get_carbon_forecast(today)
-
-    # Then schedule a job
-    await schedule_job()
+    # One client for all requests, so they share pooled keep-alive connections
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        timeout=httpx.Timeout(10.0),
+    ) as client:
+        # Get today's carbon forecast and schedule a job concurrently; the two
+        # requests are independent
+        today = datetime.utcnow().date().isoformat()
+        forecast, result = await asyncio.gather(
+            get_carbon_forecast(client, today), schedule_job(client)
+        )
+
+    # Print once both have finished so the output is not interleaved
+    if forecast is not None:
+        print_forecast(today, forecast)
+    if result is not None:
+        print_schedule(result)
 
 
 if __name__ == "__main__":
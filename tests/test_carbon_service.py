@@ -1,10 +1,16 @@
 """Tests for the carbon intensity service."""
 
+import asyncio
+import json
 import pytest
 import httpx
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
+from pydantic import ValidationError
 
 
+from app.models.carbon import CarbonIndex
+from app.services.cache_service import cache_service
 from app.services.carbon_service import CarbonIntensityService
 from app.utils.exceptions import CarbonAPIUnavailableError, CarbonAPIResponseError
 
@@ -43,7 +49,6 @@ def mock_carbon_api_error_response():
     return {"error": {"code": "400 Bad Request", "message": "Invalid date format"}}
 
 
-@pytest.mark.asyncio
 async def test_get_intensity_for_period_success(
     carbon_service_with_cache, mock_carbon_api_response
 ):
@@ -71,7 +76,6 @@ async def test_get_intensity_for_period_success(
         assert result.intensity_index == "low"
 
 
-@pytest.mark.asyncio
 async def test_get_intensity_for_period_api_error(
     carbon_service_with_cache, mock_carbon_api_error_response
 ):
@@ -91,7 +95,6 @@ async def test_get_intensity_for_period_api_error(
             await carbon_service_with_cache.get_intensity_for_period(date_str, period)
 
 
-@pytest.mark.asyncio
 async def test_get_intensity_for_period_api_unavailable(carbon_service_no_cache):
     """Test handling of API unavailability when getting intensity for a period."""
     # Setup
@@ -108,7 +111,6 @@ async def test_get_intensity_for_period_api_unavailable(carbon_service_no_cache)
             await carbon_service_no_cache.get_intensity_for_period(date_str, period)
 
 
-@pytest.mark.asyncio
 async def test_get_intensity_for_date_success(carbon_service_with_cache):
     """Test successful retrieval of carbon intensity for a full day."""
     # Setup
@@ -148,7 +150,6 @@ async def test_get_intensity_for_date_success(carbon_service_with_cache):
         assert result.forecast_periods[1].intensity_forecast == 190
 
 
-@pytest.mark.asyncio
 async def test_get_intensity_for_date_range(carbon_service_with_cache):
     """Test retrieval of carbon intensity for a date range."""
     # Setup
@@ -175,7 +176,6 @@ async def test_get_intensity_for_date_range(carbon_service_with_cache):
         mock_get_for_date.assert_any_call(end_date)
 
 
-@pytest.mark.asyncio
 async def test_caching(carbon_service_with_cache, mock_carbon_api_response):
     """Test that caching works correctly."""
     # Setup
@@ -224,3 +224,236 @@ async def test_caching(carbon_service_with_cache, mock_carbon_api_response):
         assert result.intensity_forecast == 120
         assert result.intensity_actual == 115
         assert result.intensity_index == "low"
+
+
+async def test_invalid_period_data_not_cached(carbon_service_with_cache):
+    """Test that API data failing validation is not cached."""
+    # Setup
+    date_str = "2024-06-24"
+    period = 29
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "from": "2024-06-24T14:00Z",
+                "to": "2024-06-24T14:30Z",
+                "intensity": {"forecast": "n/a", "actual": None, "index": "low"},
+            }
+        ]
+    }
+
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)):
+        # Execute and verify
+        with pytest.raises(ValidationError):
+            await carbon_service_with_cache.get_intensity_for_period(date_str, period)
+
+    cache_key = cache_service.get_carbon_forecast_key(date_str, (period,))
+    assert await cache_service.get(cache_key) is None
+
+
+async def test_get_intensity_for_date_json_cached(carbon_service_with_cache):
+    """Test that the serialized forecast is cached and served without the API."""
+    # Setup
+    date_str = "2024-06-22"
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "from": "2024-06-22T00:00Z",
+                "to": "2024-06-22T00:30Z",
+                "intensity": {"forecast": 210, "actual": 205, "index": "moderate"},
+            }
+        ]
+    }
+
+    with patch(
+        "httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)
+    ) as mock_get:
+        # First call - should hit the API and serialize the forecast
+        first = await carbon_service_with_cache.get_intensity_for_date_json(date_str)
+
+        # Second call - should be served from the cache
+        second = await carbon_service_with_cache.get_intensity_for_date_json(date_str)
+
+        # Verify
+        assert mock_get.call_count == 1
+        assert first == second
+        data = json.loads(first)
+        assert data["date"] == date_str
+        assert data["forecast_periods"][0]["intensity_forecast"] == 210
+        assert data["forecast_periods"][0]["intensity_index"] == "moderate"
+
+
+async def test_get_intensity_for_date_coalesces_concurrent_requests(
+    carbon_service_no_cache,
+):
+    """Test that concurrent requests for one date share a single API call."""
+    # Setup
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "from": "2024-06-27T00:00Z",
+                "to": "2024-06-27T00:30Z",
+                "intensity": {"forecast": 90, "actual": None, "index": "low"},
+            }
+        ]
+    }
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    with patch(
+        "httpx.AsyncClient.get", new=AsyncMock(side_effect=slow_get)
+    ) as mock_get:
+        # Execute
+        results = await asyncio.gather(
+            *(
+                carbon_service_no_cache.get_intensity_for_date("2024-06-27")
+                for _ in range(5)
+            )
+        )
+
+        # Verify
+        assert mock_get.call_count == 1
+        assert all(r is results[0] for r in results)
+        assert not carbon_service_no_cache._inflight
+
+
+async def test_get_intensity_for_date_range_error(carbon_service_with_cache):
+    """Test that a failing date raises only after every date was fetched."""
+    # Setup
+    forecast = MagicMock()
+
+    async def get_for_date(date_str):
+        if date_str == "2024-06-20":
+            raise CarbonAPIUnavailableError("Carbon API request timed out")
+        return forecast
+
+    with patch.object(
+        carbon_service_with_cache,
+        "get_intensity_for_date",
+        new=AsyncMock(side_effect=get_for_date),
+    ) as mock_get_for_date:
+        # Execute and verify
+        with pytest.raises(CarbonAPIUnavailableError):
+            await carbon_service_with_cache.get_intensity_for_date_range(
+                "2024-06-20", "2024-06-22"
+            )
+
+        assert mock_get_for_date.await_count == 3
+
+
+async def test_get_intensity_for_date_range_json(carbon_service_with_cache):
+    """Test that the range JSON matches the per-day forecasts, keyed by date."""
+    # Setup
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "from": "2024-06-25T00:00Z",
+                "to": "2024-06-25T00:30Z",
+                "intensity": {"forecast": 180, "actual": None, "index": "moderate"},
+            }
+        ]
+    }
+
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)):
+        # Dates given in reverse order should still produce an ascending range
+        range_json = await carbon_service_with_cache.get_intensity_for_date_range_json(
+            "2024-06-26", "2024-06-25"
+        )
+        day_json = await carbon_service_with_cache.get_intensity_for_date_json(
+            "2024-06-25"
+        )
+
+    # Verify
+    data = json.loads(range_json)
+    assert list(data) == ["2024-06-25", "2024-06-26"]
+    assert data["2024-06-25"] == json.loads(day_json)
+    assert data["2024-06-25"]["forecast_periods"][0]["intensity_forecast"] == 180
+
+
+async def test_get_intensity_for_date_cache_hit(carbon_service_with_cache):
+    """Test that a cached forecast is rebuilt with the same data and types."""
+    # Setup
+    date_str = "2024-06-23"
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "from": "2024-06-23T00:30Z",
+                "to": "2024-06-23T01:00Z",
+                "intensity": {"forecast": 90, "actual": None, "index": "very low"},
+            }
+        ]
+    }
+
+    with patch(
+        "httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)
+    ) as mock_get:
+        # First call - should hit the API
+        fetched = await carbon_service_with_cache.get_intensity_for_date(date_str)
+
+        # Second call - should use cache
+        cached = await carbon_service_with_cache.get_intensity_for_date(date_str)
+
+        # Verify
+        assert mock_get.call_count == 1
+        assert cached == fetched
+        assert cached.forecast_periods[0].period == 2
+        assert cached.forecast_periods[0].intensity_index is CarbonIndex.VERY_LOW
+        assert cached.model_dump_json() == fetched.model_dump_json()
+
+
+async def test_warm_cache(carbon_service_with_cache):
+    """Test that warming the cache fetches today's and tomorrow's forecasts."""
+    today = datetime.now(UTC).date()
+    tomorrow = today + timedelta(days=1)
+
+    with patch.object(
+        carbon_service_with_cache,
+        "get_intensity_for_date_json",
+        new=AsyncMock(return_value=b"{}"),
+    ) as mock_get_json:
+        # Execute
+        await carbon_service_with_cache.warm_cache()
+
+        # Verify
+        assert mock_get_json.call_count == 2
+        mock_get_json.assert_any_call(today.isoformat())
+        mock_get_json.assert_any_call(tomorrow.isoformat())
+
+
+async def test_client_recreated_after_close(
+    carbon_service_no_cache, mock_carbon_api_response
+):
+    """Test that requests still work after the shared client was closed."""
+    # Setup
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = mock_carbon_api_response
+
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)):
+        # A first app lifespan uses and then closes the client
+        await carbon_service_no_cache.get_intensity_for_period("2024-06-20", 29)
+        await carbon_service_no_cache.close()
+
+        # Execute: a request made during a second lifespan
+        result = await carbon_service_no_cache.get_intensity_for_period(
+            "2024-06-20", 29
+        )
+
+    # Verify
+    assert result.intensity_forecast == 120
+    assert not carbon_service_no_cache._client.is_closed
+    await carbon_service_no_cache.close()
@@ -0,0 +1,98 @@
+"""Tests for the ASGI middleware."""
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.middleware import WildcardCORSMiddleware
+
+ORIGIN = "https://example.com"
+
+
+async def ping(request):
+    return PlainTextResponse("pong")
+
+
+@pytest.fixture(scope="module")
+def cors_app():
+    """Fixture for a minimal app wrapped in the CORS middleware."""
+    return WildcardCORSMiddleware(Starlette(routes=[Route("/ping", ping)]))
+
+
+@pytest.fixture
+async def client(cors_app):
+    """Fixture for an HTTP client talking to the app in-process."""
+    transport = httpx.ASGITransport(app=cors_app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+async def test_preflight_request(client):
+    """Test that a preflight request is answered without calling the app."""
+    # Execute
+    response = await client.options(
+        "/ping",
+        headers={
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type, x-job-token",
+        },
+    )
+
+    # Verify
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == (
+        "content-type, x-job-token"
+    )
+    allowed_methods = response.headers["access-control-allow-methods"].split(", ")
+    assert {"GET", "POST", "OPTIONS"} <= set(allowed_methods)
+    assert "Origin" in response.headers["vary"]
+
+
+async def test_preflight_request_without_requested_headers(client):
+    """Test that no allowed headers are sent when none were requested."""
+    # Execute
+    response = await client.options(
+        "/ping",
+        headers={"Origin": ORIGIN, "Access-Control-Request-Method": "GET"},
+    )
+
+    # Verify
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert "access-control-allow-headers" not in response.headers
+
+
+async def test_simple_cross_origin_request(client):
+    """Test that a cross-origin request gets the origin echoed back."""
+    # Execute
+    response = await client.get("/ping", headers={"Origin": ORIGIN})
+
+    # Verify
+    assert response.status_code == 200
+    assert response.text == "pong"
+    # Credentials are allowed, so the origin is echoed rather than "*"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+    assert "access-control-allow-methods" not in response.headers
+
+
+async def test_same_origin_request(client):
+    """Test that a request without an Origin header gets no CORS grant."""
+    # Execute
+    response = await client.get("/ping")
+
+    # Verify
+    assert response.status_code == 200
+    assert response.text == "pong"
+    assert "access-control-allow-origin" not in response.headers
+    assert "access-control-allow-credentials" not in response.headers
+    assert response.headers["vary"] == "Origin"
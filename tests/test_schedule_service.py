@@ -1,384 +1,402 @@
 """Tests for the schedule service."""
 
 import pytest
-from datetime import datetime, timedelta, UTC
-from unittest.mock import patch, AsyncMock
+import time_machine
+from array import array
+from datetime import datetime, time, timedelta, UTC
 
 from app.models.scheduling import JobScheduleRequest, Priority
 from app.models.carbon import CarbonIndex
-from app.services.schedule_service import ScheduleService
-from app.utils.exceptions import InvalidScheduleRequestError
+from app.services.schedule_service import ScheduleService, _DayForecast
+from app.utils.exceptions import InvalidScheduleRequestError, NoViableTimeSlotError
 
+# Instant the scheduling tests freeze the clock at, the dates the mock forecast
+# covers, their midnight (UTC) anchors and the length of a forecast period
+NOW = datetime(2024, 6, 20, 12, 0, tzinfo=UTC)
+TODAY = NOW.date()
+TOMORROW = TODAY + timedelta(days=1)
+MIDNIGHT = time(0, 0, tzinfo=UTC)
+TODAY_MIDNIGHT = datetime.combine(TODAY, MIDNIGHT)
+HALF_HOUR = timedelta(minutes=30)
 
-@pytest.fixture
+# Enum members the tests use, bound once
+P_LOW = Priority.LOW
+CI_LOW = CarbonIndex.LOW
+CI_VLOW = CarbonIndex.VERY_LOW
+
+# Request fields shared by the tests that only exercise service validation
+REQUEST_FIELDS = {"job_duration_minutes": 60, "job_name": "test-job", "priority": P_LOW}
+
+
+def _make_request(**fields):
+    """Build a scheduling request without running Pydantic validation."""
+    return JobScheduleRequest.model_construct(**{**REQUEST_FIELDS, **fields})
+
+
+@pytest.fixture(scope="module")
 def schedule_service():
-    """Fixture for the schedule service."""
+    """
+    Fixture for the schedule service, shared by the whole module.
+
+    ScheduleService holds no state, so tests must not set attributes on it
+    except through monkeypatch, which restores them.
+    """
     return ScheduleService()
 
 
-@pytest.fixture
-def mock_carbon_data():
-    """Fixture for mock carbon intensity data."""
+@pytest.fixture(scope="session")
+def now():
+    """Fixture for the instant the scheduling tests run at."""
+    return NOW
+
+
+@pytest.fixture(scope="session")
+def deadline_future(now):
+    """Fixture for a deadline leaving a day to schedule in."""
+    return now + timedelta(days=1)
+
+
+@pytest.fixture(scope="session")
+def deadline_past(now):
+    """Fixture for a deadline that has already passed."""
+    return now - timedelta(hours=1)
+
+
+@pytest.fixture(scope="session")
+def deadline_soon(now):
+    """Fixture for a deadline too soon for the shortest job."""
+    return now + timedelta(minutes=20)
+
+
+# Today's forecast intensity for each of its 48 periods: moderate all day but
+# for a greener dip over periods 29-32 (14:00-16:00 UTC)
+TODAY_INTENSITIES = [200] * 48
+TODAY_INTENSITIES[28:32] = [120, 110, 100, 105]
+
+_index_for = ScheduleService()._get_carbon_index
+
+# Mock forecast periods as (period, intensity, index), keyed by date
+MOCK_FORECAST_SPEC = {
+    TODAY: [
+        (period, intensity, _index_for(intensity))
+        for period, intensity in enumerate(TODAY_INTENSITIES, start=1)
+    ],
+    TOMORROW: [
+        (1, 150, CI_LOW),
+    ],
+}
+
+
+@pytest.fixture(scope="session")
+def mock_carbon_forecast():
+    """Fixture for mock carbon intensity forecasts, as the carbon service returns them."""
     from app.models.carbon import CarbonForecast, CarbonIntensityPeriod
 
-    # Get current date and next day for testing
-    now = datetime.now(UTC)
-    today_date = now.date()
-    tomorrow_date = (now + timedelta(days=1)).date()
-
-    today_str = today_date.strftime("%Y-%m-%d")
-    tomorrow_str = tomorrow_date.strftime("%Y-%m-%d")
-
-    # Create proper CarbonForecast objects with forecast_periods
-    today_periods = [
-        CarbonIntensityPeriod(
-            period=1,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            ),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(minutes=30),
-            intensity_forecast=200,
-            intensity_index=CarbonIndex.MODERATE,
-        ),
-        CarbonIntensityPeriod(
-            period=2,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(minutes=30),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(minutes=60),
-            intensity_forecast=180,
-            intensity_index=CarbonIndex.LOW,
-        ),
-        CarbonIntensityPeriod(
-            period=29,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=14),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=14, minutes=30),
-            intensity_forecast=120,
-            intensity_index=CarbonIndex.LOW,
-        ),
-        CarbonIntensityPeriod(
-            period=30,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=14, minutes=30),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=15),
-            intensity_forecast=110,
-            intensity_index=CarbonIndex.LOW,
-        ),
-        CarbonIntensityPeriod(
-            period=31,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=15),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=15, minutes=30),
-            intensity_forecast=100,
-            intensity_index=CarbonIndex.VERY_LOW,
-        ),
-        CarbonIntensityPeriod(
-            period=32,
-            start_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=15, minutes=30),
-            end_time=datetime.combine(
-                today_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(hours=16),
-            intensity_forecast=105,
-            intensity_index=CarbonIndex.LOW,
-        ),
-    ]
+    forecasts = {}
+    for day, spec in MOCK_FORECAST_SPEC.items():
+        midnight = datetime.combine(day, MIDNIGHT)
+        forecasts[day.isoformat()] = CarbonForecast(
+            date=day.isoformat(),
+            forecast_periods=[
+                CarbonIntensityPeriod(
+                    period=period,
+                    start_time=midnight + (period - 1) * HALF_HOUR,
+                    end_time=midnight + period * HALF_HOUR,
+                    intensity_forecast=intensity,
+                    intensity_index=index,
+                )
+                for period, intensity, index in spec
+            ],
+            data_freshness=TODAY_MIDNIGHT,
+        )
+    return forecasts
 
-    tomorrow_periods = [
-        CarbonIntensityPeriod(
-            period=1,
-            start_time=datetime.combine(
-                tomorrow_date, datetime.min.time().replace(tzinfo=UTC)
-            ),
-            end_time=datetime.combine(
-                tomorrow_date, datetime.min.time().replace(tzinfo=UTC)
-            )
-            + timedelta(minutes=30),
-            intensity_forecast=150,
-            intensity_index=CarbonIndex.LOW,
-        ),
-    ]
 
+@pytest.fixture(scope="session")
+def mock_processed_carbon_data():
+    """
+    Fixture for the mock forecast as _get_carbon_data_for_windows hands it to
+    window scoring, built without going through the Pydantic models.
+    """
     return {
-        today_str: CarbonForecast(
-            date=today_str,
-            forecast_periods=today_periods,
-            data_freshness=datetime.now(UTC),
-        ),
-        tomorrow_str: CarbonForecast(
-            date=tomorrow_str,
-            forecast_periods=tomorrow_periods,
-            data_freshness=datetime.now(UTC),
-        ),
+        day.isoformat(): _DayForecast(
+            periods=array("l", [period for period, _, _ in spec]),
+            intensities=array("l", [intensity for _, intensity, _ in spec]),
+            data_freshness=TODAY_MIDNIGHT,
+        )
+        for day, spec in MOCK_FORECAST_SPEC.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def green_carbon_data():
+    """
+    Fixture for processed carbon data that is very low all day today and even
+    lower over the next two days.
+    """
+    return {
+        (TODAY + timedelta(days=offset)).isoformat(): _DayForecast(
+            periods=array("l", range(1, 49)),
+            intensities=array("l", [intensity] * 48),
+            data_freshness=TODAY_MIDNIGHT,
+        )
+        for offset, intensity in ((0, 90), (1, 50), (2, 50))
     }
 
 
-@pytest.mark.asyncio
-async def test_schedule_job_success(schedule_service, mock_carbon_data):
+class _StubCarbonService:
+    """Stand-in for the carbon service that returns canned forecasts."""
+
+    def __init__(self, forecasts):
+        self._forecasts = forecasts
+
+    async def get_intensity_for_date_range(self, start_date, end_date):
+        return self._forecasts
+
+
+@pytest.fixture(autouse=True)
+def _stub_carbon_service(monkeypatch, mock_carbon_forecast):
+    """Serve the mock forecast in place of the carbon API in every test."""
+    monkeypatch.setattr(
+        "app.services.schedule_service.carbon_service",
+        _StubCarbonService(mock_carbon_forecast),
+    )
+
+
+def _feed_processed_data(monkeypatch, schedule_service, carbon_data):
+    """Hand carbon data straight to window scoring, skipping the carbon service."""
+
+    async def get_carbon_data_for_windows(first_start, last_end):
+        return carbon_data
+
+    monkeypatch.setattr(
+        schedule_service, "_get_carbon_data_for_windows", get_carbon_data_for_windows
+    )
+
+
+@pytest.fixture(params=["forecast", "processed"])
+def mock_carbon_data(
+    request, monkeypatch, schedule_service, mock_processed_carbon_data
+):
+    """
+    Fixture feeding the mock forecast to the schedule service at a given layer.
+
+    At the "forecast" layer the stub carbon service response is used as is, so
+    the scheduler processes it itself; at the "processed" layer the same
+    forecast is handed straight to window scoring.
+    """
+    if request.param == "processed":
+        _feed_processed_data(monkeypatch, schedule_service, mock_processed_carbon_data)
+    return request.param
+
+
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_success(
+    schedule_service, mock_carbon_data, deadline_future
+):
     """Test successful job scheduling."""
     # Setup
-    now = datetime.now(UTC)
-    deadline = now + timedelta(days=1)
-
     request = JobScheduleRequest(
         job_duration_minutes=60,
-        deadline_utc=deadline,
+        deadline_utc=deadline_future,
         job_name="test-job",
-        priority=Priority.LOW,
+        priority=P_LOW,
     )
 
-    # Mock the carbon service and time utils to properly match periods
-    with (
-        patch("app.services.schedule_service.carbon_service") as mock_carbon_service,
-        patch(
-            "app.services.schedule_service.get_date_periods_between"
-        ) as mock_date_periods,
-    ):
-        # Set up mock for carbon service
-        mock_carbon_service.get_intensity_for_date_range = AsyncMock()
-        mock_carbon_service.get_intensity_for_date_range.return_value = mock_carbon_data
-
-        # Mock _get_carbon_data_for_windows to return the exact format expected by _calculate_window_intensity
-        with patch.object(
-            schedule_service, "_get_carbon_data_for_windows"
-        ) as mock_get_carbon_data:
-            today_str = datetime.now(UTC).date().strftime("%Y-%m-%d")
-
-            # Set up the carbon data in the exact format expected by _calculate_window_intensity
-            processed_carbon_data = {
-                today_str: [
-                    {
-                        "period": 1,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        ),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(minutes=30),
-                        "intensity": 120,
-                        "index": CarbonIndex.LOW,
-                    },
-                    {
-                        "period": 2,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(minutes=30),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(minutes=60),
-                        "intensity": 110,
-                        "index": CarbonIndex.LOW,
-                    },
-                    {
-                        "period": 29,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=14),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=14, minutes=30),
-                        "intensity": 100,
-                        "index": CarbonIndex.VERY_LOW,
-                    },
-                    {
-                        "period": 30,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=14, minutes=30),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=15),
-                        "intensity": 105,
-                        "index": CarbonIndex.LOW,
-                    },
-                    {
-                        "period": 31,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=15),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=15, minutes=30),
-                        "intensity": 95,
-                        "index": CarbonIndex.VERY_LOW,
-                    },
-                    {
-                        "period": 32,
-                        "start_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=15, minutes=30),
-                        "end_time": datetime.combine(
-                            datetime.now(UTC).date(),
-                            datetime.min.time().replace(tzinfo=UTC),
-                        )
-                        + timedelta(hours=16),
-                        "intensity": 100,
-                        "index": CarbonIndex.VERY_LOW,
-                    },
-                ]
-            }
-
-            # Set up the mock to return our processed data
-            mock_get_carbon_data.return_value = processed_carbon_data
-
-            # Set up mock for date periods - ensure we return periods that match our mock data
-            mock_date_periods.return_value = {
-                today_str: [
-                    1,
-                    2,
-                    29,
-                    30,
-                    31,
-                    32,
-                ]  # These match the periods in our processed data
-            }
-
-        # Execute
-        result = await schedule_service.schedule_job(request)
-
-        # Verify
-        assert result is not None
-        assert result.optimal_start_time is not None
-        assert result.optimal_end_time is not None
-        # The optimal slot should be where carbon intensity is lowest
-        assert result.carbon_intensity <= 150  # Based on our mock data
-
-
-@pytest.mark.asyncio
-async def test_schedule_job_invalid_duration(schedule_service):
-    """Test job scheduling with invalid duration."""
-    from pydantic import ValidationError
+    # Execute
+    result = await schedule_service.schedule_job(request)
+
+    # Verify: the 15:00-16:00 window spans periods 31 and 32
+    assert result.optimal_start_time == datetime(2024, 6, 20, 15, 0, tzinfo=UTC)
+    assert result.optimal_end_time == datetime(2024, 6, 20, 16, 0, tzinfo=UTC)
+    assert result.carbon_intensity == 102
+    assert result.carbon_index == CI_LOW
+    assert [
+        (slot.start_time, slot.carbon_intensity) for slot in result.alternative_slots
+    ] == [
+        (datetime(2024, 6, 20, 14, 30, tzinfo=UTC), 105),
+        (datetime(2024, 6, 20, 14, 0, tzinfo=UTC), 115),
+        # Only period 1 of tomorrow has a forecast
+        (datetime(2024, 6, 21, 0, 0, tzinfo=UTC), 150),
+    ]
+    # The mock forecast was fetched at midnight
+    assert result.scheduling_metadata.cached_data_age_minutes == 720
+
+
+def test_calculate_window_intensities_across_midnight(schedule_service):
+    """Test that windows crossing midnight average periods from both days."""
+    # Setup
+    carbon_data = {
+        TODAY.isoformat(): _DayForecast(
+            periods=array("l", [47, 48]),
+            intensities=array("l", [100, 200]),
+            data_freshness=TODAY_MIDNIGHT,
+        ),
+        TOMORROW.isoformat(): _DayForecast(
+            periods=array("l", [1, 2]),
+            intensities=array("l", [300, 400]),
+            data_freshness=TODAY_MIDNIGHT,
+        ),
+    }
+
+    # Execute
+    averages = schedule_service._calculate_window_intensities(
+        TODAY_MIDNIGHT + 46 * HALF_HOUR, 2 * HALF_HOUR, 3, carbon_data
+    )
+
+    # Verify: windows start at 23:00, 23:30 and 00:00
+    assert list(averages) == [150, 250, 350]
+
+
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_skips_windows_without_data(
+    schedule_service, monkeypatch, deadline_future
+):
+    """Test that windows with no forecast data are never picked."""
+    # Setup: a forecast for periods 29-32 of today only
+    carbon_data = {
+        TODAY.isoformat(): _DayForecast(
+            periods=array("l", [29, 30, 31, 32]),
+            intensities=array("l", [120, 110, 100, 105]),
+            data_freshness=NOW - timedelta(minutes=15),
+        )
+    }
+    _feed_processed_data(monkeypatch, schedule_service, carbon_data)
+    request = _make_request(deadline_utc=deadline_future)
+
+    # Execute
+    result = await schedule_service.schedule_job(request)
+
+    # Verify: the 13:30 and 15:30 windows overlap the forecast by one period
+    assert result.optimal_start_time == datetime(2024, 6, 20, 15, 0, tzinfo=UTC)
+    assert result.carbon_intensity == 102
+    assert [
+        (slot.start_time, slot.carbon_intensity) for slot in result.alternative_slots
+    ] == [
+        (datetime(2024, 6, 20, 14, 30, tzinfo=UTC), 105),
+        (datetime(2024, 6, 20, 15, 30, tzinfo=UTC), 105),
+        (datetime(2024, 6, 20, 14, 0, tzinfo=UTC), 115),
+    ]
+    assert result.scheduling_metadata.cached_data_age_minutes == 15
+
+
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_no_data(schedule_service, monkeypatch, deadline_future):
+    """Test job scheduling when no window has forecast data."""
+    # Setup
+    _feed_processed_data(monkeypatch, schedule_service, {})
+    request = _make_request(deadline_utc=deadline_future)
+
+    # Execute and verify
+    with pytest.raises(NoViableTimeSlotError):
+        await schedule_service.schedule_job(request)
+
+
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_first_green_mode(
+    schedule_service, monkeypatch, now, green_carbon_data
+):
+    """Test that first-green mode returns the earliest very low intensity slot."""
+
+    # Setup
+    def make_request(mode):
+        return JobScheduleRequest(
+            job_duration_minutes=60,
+            deadline_utc=now + timedelta(hours=40),
+            mode=mode,
+        )
+
+    _feed_processed_data(monkeypatch, schedule_service, green_carbon_data)
+
+    # Execute
+    optimal = await schedule_service.schedule_job(make_request("optimal"))
+    first_green = await schedule_service.schedule_job(make_request("first_green"))
+
+    # Verify
+    assert optimal.carbon_intensity == 50
+    assert first_green.carbon_intensity <= 100
+    assert first_green.carbon_index == CI_VLOW
+    assert first_green.optimal_start_time < optimal.optimal_start_time
+    assert first_green.alternative_slots == []
 
-    # Test the Pydantic validation first
-    now = datetime.now(UTC)
-    deadline = now + timedelta(days=1)
+
+async def test_processed_carbon_data_matches_service(
+    schedule_service, mock_processed_carbon_data
+):
+    """Test that the processed layer feeds what the service builds itself."""
+    # Execute
+    result = await schedule_service._get_carbon_data_for_windows(
+        NOW, NOW + timedelta(days=1)
+    )
+
+    # Verify
+    assert result == mock_processed_carbon_data
+
+
+def test_schedule_request_duration_validated(deadline_future):
+    """Test Pydantic validation of the job duration."""
+    from pydantic import ValidationError
 
     # Verify Pydantic validation for too short duration
     with pytest.raises(ValidationError) as exc_info:
         JobScheduleRequest(
             job_duration_minutes=10,  # Too short (min is 30)
-            deadline_utc=deadline,
+            deadline_utc=deadline_future,
             job_name="test-job",
-            priority=Priority.LOW,
+            priority=P_LOW,
         )
     assert "job_duration_minutes" in str(exc_info.value)
     assert "greater than or equal to 30" in str(exc_info.value)
 
-    # Create a valid request object first, then modify it to bypass Pydantic validation
-    valid_request = JobScheduleRequest(
-        job_duration_minutes=30,  # Valid value
-        deadline_utc=deadline,
-        job_name="test-job",
-        priority=Priority.LOW,
-    )
 
-    # Now modify the valid object to have an invalid duration
-    valid_request.job_duration_minutes = (
-        10  # Too short, should be caught by service validation
+@pytest.mark.parametrize("bad_duration", [10, 2000])
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_invalid_duration(
+    schedule_service, bad_duration, deadline_future
+):
+    """Test job scheduling with invalid duration."""
+    # Setup: skip Pydantic validation so the service validation is exercised
+    request = _make_request(
+        job_duration_minutes=bad_duration, deadline_utc=deadline_future
     )
 
-    # Execute and verify service validation
+    # Execute and verify
     with pytest.raises(InvalidScheduleRequestError):
-        await schedule_service.schedule_job(valid_request)
+        await schedule_service.schedule_job(request)
 
-    # Test too long duration
-    # First create a valid request, then modify it
-    valid_request = JobScheduleRequest(
-        job_duration_minutes=60,
-        deadline_utc=deadline,
-        job_name="test-job",
-        priority=Priority.LOW,
-    )
 
-    # Now modify to have an invalid duration that's too long
-    valid_request.job_duration_minutes = (
-        2000  # Too long, should be caught by service validation
+def test_schedule_request_deadline_normalized_to_utc():
+    """Test that naive and non-UTC deadlines are converted to UTC."""
+    naive = JobScheduleRequest(
+        job_duration_minutes=60, deadline_utc="2024-06-20T18:00:00"
+    )
+    offset = JobScheduleRequest(
+        job_duration_minutes=60, deadline_utc="2024-06-20T19:00:00+01:00"
     )
 
-    # Execute and verify service validation
-    with pytest.raises(InvalidScheduleRequestError):
-        await schedule_service.schedule_job(valid_request)
+    expected = datetime(2024, 6, 20, 18, 0, tzinfo=UTC)
+    assert naive.deadline_utc == expected
+    assert naive.deadline_utc.tzinfo is UTC
+    assert offset.deadline_utc == expected
+    assert offset.deadline_utc.tzinfo is UTC
 
 
-@pytest.mark.asyncio
-async def test_schedule_job_deadline_in_past(schedule_service):
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_deadline_in_past(schedule_service, deadline_past):
     """Test job scheduling with deadline in the past."""
     # Setup
-    now = datetime.now(UTC)
-    deadline = now - timedelta(hours=1)  # In the past
-
-    request = JobScheduleRequest(
-        job_duration_minutes=60,
-        deadline_utc=deadline,
-        job_name="test-job",
-        priority=Priority.LOW,
-    )
+    request = _make_request(deadline_utc=deadline_past)
 
     # Execute and verify
     with pytest.raises(InvalidScheduleRequestError):
         await schedule_service.schedule_job(request)
 
 
-@pytest.mark.asyncio
-async def test_schedule_job_not_enough_time(schedule_service):
+@time_machine.travel(NOW, tick=False)
+async def test_schedule_job_not_enough_time(schedule_service, deadline_soon):
     """Test job scheduling when there's not enough time before deadline."""
-    # Setup
-    now = datetime.now(UTC)
-    deadline = now + timedelta(minutes=20)  # Not enough time for a 30-min job
-
-    request = JobScheduleRequest(
-        job_duration_minutes=30,
-        deadline_utc=deadline,
-        job_name="test-job",
-        priority=Priority.LOW,
-    )
+    # Setup: not enough time for a 30-min job
+    request = _make_request(job_duration_minutes=30, deadline_utc=deadline_soon)
 
     # Execute and verify
     with pytest.raises(InvalidScheduleRequestError):
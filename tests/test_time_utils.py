@@ -0,0 +1,83 @@
+"""Tests for the time utility functions."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.utils.time_utils import (
+    count_time_windows,
+    generate_time_windows,
+    get_date_periods_between,
+)
+
+
+def _at(hour, minute=0, day=20):
+    """Build a UTC datetime on a June 2024 day."""
+    return datetime(2024, 6, day, hour, minute, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "start, end, window_minutes, expected_count, expected_minutes",
+    [
+        # Aligned: windows start at 12:00, 12:30 and 13:00
+        (_at(12), _at(14), 60, 3, 60),
+        # Unaligned start: the 13:10 window would end after the deadline
+        (_at(12, 10), _at(14), 60, 2, 60),
+        # Durations round up to a multiple of 30 minutes
+        (_at(12), _at(13), 45, 1, 60),
+        # Durations below 30 minutes are raised to 30
+        (_at(12), _at(13), 10, 2, 30),
+        # Windows may cross midnight
+        (_at(23), _at(1, day=21), 90, 2, 90),
+        # Not enough time for a single window
+        (_at(12), _at(12, 20), 30, 0, 30),
+    ],
+)
+def test_count_time_windows(
+    start, end, window_minutes, expected_count, expected_minutes
+):
+    """Test the window count and rounded window length."""
+    count, delta = count_time_windows(start, end, window_minutes)
+
+    assert count == expected_count
+    assert delta == timedelta(minutes=expected_minutes)
+
+
+def test_generate_time_windows():
+    """Test that windows start every 30 minutes and end by the deadline."""
+    windows = generate_time_windows(_at(23, 10), _at(1, day=21), 45)
+
+    assert windows == [
+        (_at(23, 10), _at(0, 10, day=21)),
+        (_at(23, 40), _at(0, 40, day=21)),
+    ]
+
+
+def test_generate_time_windows_not_enough_time():
+    """Test that no windows are generated when none fits."""
+    assert generate_time_windows(_at(12), _at(12, 20), 30) == []
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        # Aligned start and end
+        (_at(12), _at(13), {"2024-06-20": [25, 26]}),
+        # Unaligned start and end include the periods they fall in
+        (_at(12, 10), _at(13, 10), {"2024-06-20": [25, 26, 27]}),
+        # Crossing midnight
+        (
+            _at(23),
+            _at(1, day=21),
+            {"2024-06-20": [47, 48], "2024-06-21": [1, 2]},
+        ),
+        # Ending exactly at midnight adds nothing for the next day
+        (_at(23), _at(0, day=21), {"2024-06-20": [47, 48]}),
+        # Empty and reversed ranges
+        (_at(12), _at(12), {}),
+        (_at(13), _at(12), {}),
+    ],
+)
+def test_get_date_periods_between(start, end, expected):
+    """Test that every period overlapping the range is included."""
+    assert get_date_periods_between(start, end) == expected